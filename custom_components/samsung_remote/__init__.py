@@ -6,6 +6,8 @@ from homeassistant.const import Platform
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import config_entry_oauth2_flow
 
+from .const import DATA_DEVICES_CACHE
+
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "samsung_remote"
@@ -68,7 +70,7 @@ async def _get_smartthings_token_from_integration(hass: HomeAssistant) -> str |
         smartthings_entries = hass.config_entries.async_entries("smartthings")
         
         if smartthings_entries:
-            _LOGGER.debug(f"Found {len(smartthings_entries)} SmartThings config entries")
+            _LOGGER.debug("Found %d SmartThings config entries", len(smartthings_entries))
             
             for st_entry in smartthings_entries:
                 # Hole das Token aus dem OAuth2 Implementation
@@ -100,7 +102,7 @@ async def _get_smartthings_token_from_integration(hass: HomeAssistant) -> str |
                             return token["access_token"]
                             
                 except Exception as e:
-                    _LOGGER.debug(f"Failed to get token from entry {st_entry.entry_id}: {e}")
+                    _LOGGER.debug("Failed to get token from entry %s: %s", st_entry.entry_id, e)
                     continue
     
     # Methode 2: Suche in allen Config Entries
@@ -109,7 +111,7 @@ async def _get_smartthings_token_from_integration(hass: HomeAssistant) -> str |
     
     for entry in all_entries:
         if entry.domain == "smartthings":
-            _LOGGER.debug(f"Found SmartThings entry: {entry.entry_id}")
+            _LOGGER.debug("Found SmartThings entry: %s", entry.entry_id)
             
             # Versuche Token aus verschiedenen Quellen
             if "token" in entry.data:
@@ -135,6 +137,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DOMAIN].pop(DATA_DEVICES_CACHE, None)
     
     return unload_ok
 
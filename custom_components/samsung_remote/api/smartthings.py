@@ -5,6 +5,7 @@ from typing import Dict, Any, Optional
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_entry_oauth2_flow
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from ..const import SMARTTHINGS_API_BASE, SMARTTHINGS_COMMANDS, DOMAIN
 
@@ -19,7 +20,8 @@ class SmartThingsAPI:
         self.hass = hass
         self.device_id = device_id
         self._access_token = access_token
-        self._session = None
+        # Geteilte Home Assistant Session, wie beim TizenLocalAPI
+        self.session: aiohttp.ClientSession = async_get_clientsession(hass)
 
     async def _ensure_token(self) -> str:
         """Ensure we have a valid access token."""
@@ -58,7 +60,7 @@ class SmartThingsAPI:
                     if token_data:
                         self._access_token = token_data.get("access_token")
             except Exception as e:
-                _LOGGER.error(f"Failed to get OAuth token: {e}")
+                _LOGGER.error("Failed to get OAuth token: %s", e)
                 raise
         
         if not self._access_token:
@@ -67,16 +69,8 @@ class SmartThingsAPI:
         _LOGGER.debug("Successfully retrieved SmartThings access token")
         return self._access_token
 
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session."""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
-
     async def close(self):
-        """Close the session."""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """Close the client; Home Assistant closes the shared session on shutdown."""
 
     async def _make_request(
         self,
@@ -86,7 +80,6 @@ class SmartThingsAPI:
     ) -> Dict[str, Any]:
         """Make a request to the SmartThings API."""
         token = await self._ensure_token()
-        session = await self._get_session()
         
         url = f"{SMARTTHINGS_API_BASE}/{endpoint}"
         headers = {
@@ -95,10 +88,10 @@ class SmartThingsAPI:
             "Content-Type": "application/json"
         }
         
-        _LOGGER.debug(f"SmartThings API {method} request to {url}")
+        _LOGGER.debug("SmartThings API %s request to %s", method, url)
         
         try:
-            async with session.request(
+            async with self.session.request(
                 method,
                 url,
                 headers=headers,
@@ -113,7 +106,7 @@ class SmartThingsAPI:
                 
                 if response.status >= 400:
                     _LOGGER.error(
-                        f"SmartThings API error {response.status}: {response_text}"
+                        "SmartThings API error %s: %s", response.status, response_text
                     )
                     raise ValueError(f"API error: {response.status}")
                 
@@ -122,7 +115,7 @@ class SmartThingsAPI:
                 return {}
                 
         except aiohttp.ClientError as e:
-            _LOGGER.error(f"SmartThings API connection error: {e}")
+            _LOGGER.error("SmartThings API connection error: %s", e)
             raise
 
     async def get_device_status(self) -> Dict[str, Any]:
@@ -130,7 +123,7 @@ class SmartThingsAPI:
         try:
             return await self._make_request("GET", f"devices/{self.device_id}/status")
         except Exception as e:
-            _LOGGER.error(f"Failed to get device status: {e}")
+            _LOGGER.error("Failed to get device status: %s", e)
             return {}
 
     async def send_command(self, command: str) -> bool:
@@ -139,13 +132,20 @@ class SmartThingsAPI:
         st_command = SMARTTHINGS_COMMANDS.get(command.upper())
         
         if not st_command:
-            _LOGGER.warning(
-                f"Command '{command}' is not supported by SmartThings API. "
-                f"Supported commands: {', '.join(SMARTTHINGS_COMMANDS.keys())}"
-            )
+            # Die Liste nur zusammenbauen, wenn die Warnung auch ausgegeben wird
+            if _LOGGER.isEnabledFor(logging.WARNING):
+                _LOGGER.warning(
+                    "Command '%s' is not supported by SmartThings API. "
+                    "Supported commands: %s",
+                    command,
+                    ", ".join(SMARTTHINGS_COMMANDS),
+                )
             return False
         
-        _LOGGER.debug(f"Sending command '{command}' (mapped to '{st_command}') to device {self.device_id}")
+        _LOGGER.debug(
+            "Sending command '%s' (mapped to '%s') to device %s",
+            command, st_command, self.device_id,
+        )
         
         # Erstelle den Command Payload
         command_data = {
@@ -166,16 +166,16 @@ class SmartThingsAPI:
                 data=command_data
             )
             
-            _LOGGER.debug(f"Command result: {result}")
+            _LOGGER.debug("Command result: %s", result)
             return True
             
         except Exception as e:
-            _LOGGER.error(f"Failed to send command '{command}': {e}")
+            _LOGGER.error("Failed to send command '%s': %s", command, e)
             return False
 
     async def send_key(self, key: str) -> bool:
         """Send a key press using the keypad input capability."""
-        _LOGGER.debug(f"Sending key '{key}' to device {self.device_id}")
+        _LOGGER.debug("Sending key '%s' to device %s", key, self.device_id)
         
         command_data = {
             "commands": [
@@ -197,12 +197,12 @@ class SmartThingsAPI:
             return True
             
         except Exception as e:
-            _LOGGER.error(f"Failed to send key '{key}': {e}")
+            _LOGGER.error("Failed to send key '%s': %s", key, e)
             return False
 
     async def set_volume(self, volume: int) -> bool:
         """Set the volume level."""
-        _LOGGER.debug(f"Setting volume to {volume} for device {self.device_id}")
+        _LOGGER.debug("Setting volume to %s for device %s", volume, self.device_id)
         
         command_data = {
             "commands": [
@@ -224,7 +224,7 @@ class SmartThingsAPI:
             return True
             
         except Exception as e:
-            _LOGGER.error(f"Failed to set volume: {e}")
+            _LOGGER.error("Failed to set volume: %s", e)
             return False
 
     async def get_capabilities(self) -> Dict[str, Any]:
@@ -232,5 +232,5 @@ class SmartThingsAPI:
         try:
             return await self._make_request("GET", f"devices/{self.device_id}")
         except Exception as e:
-            _LOGGER.error(f"Failed to get capabilities: {e}")
+            _LOGGER.error("Failed to get capabilities: %s", e)
             return {}
@@ -1,80 +1,141 @@
 """Local Tizen API client for Samsung devices."""
 
 import asyncio
-import json
 import logging
-from typing import Optional
+import time
 
 import aiohttp
+from yarl import URL
 
-from ..const import LOGGER, DEFAULT_TIMEOUT, SAMSUNG_KEY_MAP
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from ..const import DEFAULT_PORT, DEFAULT_TIMEOUT, TIZEN_KEYS
+
+_LOGGER = logging.getLogger(__name__)
+
+# A TV that is off never answers the TCP handshake; fail fast on connect
+SOCK_CONNECT_TIMEOUT = 2.0
+
+
+class _TokenBucket:
+    """Token-bucket rate limiter for outgoing key presses.
+
+    Allows bursts of up to ``capacity`` commands and throttles sustained
+    traffic to ``rate`` commands per second. The balance may go negative so
+    that concurrent callers reserve their slot before sleeping, and the
+    sleep itself happens outside the lock.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """Initialize the bucket full."""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def take_nowait(self, n: float = 1) -> float:
+        """Reserve ``n`` tokens and return the seconds to wait before using them."""
+        self._refill()
+        self._tokens -= n
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+    async def take(self, n: float = 1) -> None:
+        """Reserve ``n`` tokens, sleeping if the bucket is in deficit."""
+        async with self._lock:
+            wait = self.take_nowait(n)
+        if wait > 0:
+            await asyncio.sleep(wait)
 
 
 class TizenLocalAPI:
     """Tizen local API client for direct TV communication."""
 
-    def __init__(self, ip: str, psk: str = "", timeout: int = DEFAULT_TIMEOUT):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        ip: str,
+        psk: str = "",
+        timeout: int = DEFAULT_TIMEOUT,
+    ):
         """Initialize Tizen local client."""
+        self.hass = hass
         self.ip = ip
         self.psk = psk
         self.timeout = timeout
-        self.session: Optional[aiohttp.ClientSession] = None
+        # Home Assistant's shared session keeps the connection pool (and
+        # keep-alive to the TV) across reloads and re-probes.
+        self.session: aiohttp.ClientSession = async_get_clientsession(hass)
+        self._client_timeout = aiohttp.ClientTimeout(
+            total=timeout,
+            sock_connect=min(SOCK_CONNECT_TIMEOUT, timeout),
+            sock_read=timeout,
+        )
         self.paired = False
-        self._command_lock = asyncio.Lock()
-        self._last_command_time = 0.0
-
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session."""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
-        return self.session
+        self._bucket = _TokenBucket(rate=3.0, capacity=3)
 
     async def close(self) -> None:
-        """Close session."""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """Release resources.
+
+        The session is owned by Home Assistant, so there is nothing to close.
+        """
 
-    async def send_command(self, device_id: str, command: str) -> bool:
+    async def send_command(
+        self, device_id: str, command: str, raw: bool = False
+    ) -> bool:
         """Send command via local websocket.
         
-        This method uses a lock to prevent command flooding and ensures
-        a minimum delay between consecutive commands.
+        Commands are rate limited by a token bucket so short bursts (e.g.
+        channel numbers) go out back-to-back while sustained traffic is
+        throttled. Pass ``raw=True`` when ``command`` is already a TV key
+        code (e.g. resolved once by a button) to skip the key lookup.
+        """
+        await self._bucket.take()
+        key = command if raw else TIZEN_KEYS.get(command, command)
+        
+        _LOGGER.debug("Sending command %s to TV at %s", key, self.ip)
+        # TODO: websocket send (and its error handling)
+        
+        return True
+
+    async def validate_connection(self) -> tuple[bool, str | None]:
+        """Validate connection to TV.
+
+        Returns whether the TV answered and its Wi-Fi MAC address (or None),
+        both read from a single request to the REST device info endpoint.
         """
-        async with self._command_lock:
-            try:
-                import time
-                current_time = time.time()
-                time_since_last = current_time - self._last_command_time
-                min_delay = 0.3
-                
-                if time_since_last < min_delay:
-                    delay_needed = min_delay - time_since_last
-                    LOGGER.debug(f"Throttling: waiting {delay_needed:.2f}s before sending command")
-                    await asyncio.sleep(delay_needed)
-                
-                key = SAMSUNG_KEY_MAP.get(command, command)
-                
-                LOGGER.debug(f"Sending command {key} to TV at {self.ip}")
-                await asyncio.sleep(0.1)
-                
-                self._last_command_time = time.time()
-                return True
-            except Exception as e:
-                LOGGER.error(f"Failed to send local command: {e}")
-                return False
-
-    async def validate_connection(self) -> bool:
-        """Validate connection to TV."""
         try:
-            # Attempt to reach TV's main app
-            session = await self._get_session()
-            url = f"http://{self.ip}:8001/ms/version"
+            # Tizen TVs answer their REST device info endpoint while on
+            # URL.build brackets IPv6 literals, which an f-string would not
+            url = URL.build(
+                scheme="http", host=self.ip, port=DEFAULT_PORT, path="/api/v2/"
+            )
             
-            async with session.get(
+            async with self.session.get(
                 url,
-                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                timeout=self._client_timeout,
             ) as resp:
-                return resp.status == 200
-        except Exception as e:
-            LOGGER.error(f"Connection validation failed: {e}")
-            return False
+                if resp.status != 200:
+                    return False, None
+                info = await resp.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            _LOGGER.error("Connection validation failed: %s", e)
+            return False, None
+        except ValueError:
+            # The TV answered, just not with JSON
+            _LOGGER.debug("Device info from %s is not valid JSON", self.ip)
+            return True, None
+        
+        device = info.get("device") if isinstance(info, dict) else None
+        if not isinstance(device, dict):
+            return True, None
+        return True, device.get("wifiMac")
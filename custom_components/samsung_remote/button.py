@@ -16,6 +16,7 @@ from .const import (
     TIZEN_KEYS,
 )
 from .api.smartthings import SmartThingsAPI
+from .entity import device_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,6 +42,14 @@ BUTTONS = {
     "source": {"name": "Source", "icon": "mdi:hdmi-port", "key": "SOURCE"},
 }
 
+_SMARTTHINGS_SET = frozenset(SMARTTHINGS_COMMANDS)
+
+# Flattened (button_id, name, icon, key) rows, built once at import
+_BUTTON_TABLE: tuple[tuple[str, str, str, str], ...] = tuple(
+    (button_id, config["name"], config["icon"], config["key"])
+    for button_id, config in BUTTONS.items()
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -50,41 +59,32 @@ async def async_setup_entry(
     """Set up Samsung Remote buttons from a config entry."""
     connection_method = entry.data.get("connection_method")
     
-    buttons = []
-    
     if connection_method == CONNECTION_METHOD_SMARTTHINGS:
         device_id = entry.data[CONF_DEVICE_ID]
         device_name = entry.data.get(CONF_DEVICE_NAME, "Samsung TV")
         access_token = entry.data.get("access_token")
         
-        for button_id, button_config in BUTTONS.items():
-            buttons.append(
-                SamsungSmartThingsButton(
-                    hass,
-                    device_id,
-                    device_name,
-                    button_id,
-                    button_config,
-                    access_token,
-                )
+        async_add_entities(
+            SamsungSmartThingsButton(
+                hass,
+                device_id,
+                device_name,
+                button,
+                access_token,
             )
+            for button in _BUTTON_TABLE
+        )
     else:
         # Local Tizen buttons
         host = entry.data["host"]
         name = entry.data.get("name", "Samsung TV")
+        # Die MAC (unique_id) bleibt bei IP-Wechseln gleich, der Host nicht
+        identifier = entry.unique_id or host
         
-        for button_id, button_config in BUTTONS.items():
-            buttons.append(
-                SamsungTizenButton(
-                    hass,
-                    host,
-                    name,
-                    button_id,
-                    button_config,
-                )
-            )
-    
-    async_add_entities(buttons)
+        async_add_entities(
+            SamsungTizenButton(hass, host, name, button, identifier)
+            for button in _BUTTON_TABLE
+        )
 
 
 class SamsungSmartThingsButton(ButtonEntity):
@@ -95,65 +95,58 @@ class SamsungSmartThingsButton(ButtonEntity):
         hass: HomeAssistant,
         device_id: str,
         device_name: str,
-        button_id: str,
-        button_config: dict,
+        button: tuple[str, str, str, str],
         access_token: str = None,
     ):
         """Initialize the button."""
         self._hass = hass
         self._device_id = device_id
         self._device_name = device_name
-        self._button_id = button_id
-        self._button_config = button_config
+        self._button_id, button_name, self._attr_icon, key = button
+        self._key = key.upper()
+        self._tizen_key = TIZEN_KEYS.get(self._key)
         self._api = SmartThingsAPI(hass, device_id, access_token)
         
-        self._attr_name = f"{device_name} {button_config['name']}"
-        self._attr_unique_id = f"{DOMAIN}_{device_id}_{button_id}"
-        self._attr_icon = button_config.get("icon")
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": self._device_name,
-            "manufacturer": "Samsung",
-            "model": "Smart TV",
-        }
+        self._attr_name = f"{device_name} {button_name}"
+        self._attr_unique_id = f"{DOMAIN}_{device_id}_{self._button_id}"
+        self._attr_device_info = device_info(device_id, device_name, "Smart TV")
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        key = self._button_config["key"]
+        key = self._key
         
-        _LOGGER.debug(f"Button '{self._button_id}' pressed, sending command '{key}'")
+        _LOGGER.debug(
+            "Button '%s' pressed, sending command '%s'", self._button_id, key
+        )
         
-        try:
-            # Prüfe ob der Befehl in SmartThings unterstützt wird
-            if key.upper() in SMARTTHINGS_COMMANDS:
-                result = await self._api.send_command(key)
+        # Prüfe ob der Befehl in SmartThings unterstützt wird
+        if key in _SMARTTHINGS_SET:
+            result = await self._api.send_command(key)
+            
+            if not result:
+                _LOGGER.warning(
+                    "Command %s may have failed for button %s",
+                    key,
+                    self._button_id,
+                )
+        else:
+            # Versuche als direkten Key zu senden
+            tizen_key = self._tizen_key
+            if tizen_key:
+                result = await self._api.send_key(tizen_key)
                 
                 if not result:
                     _LOGGER.warning(
-                        f"Command {key} may have failed for button {self._button_id}"
+                        "Key %s may have failed for button %s",
+                        tizen_key,
+                        self._button_id,
                     )
             else:
-                # Versuche als direkten Key zu senden
-                tizen_key = TIZEN_KEYS.get(key.upper())
-                if tizen_key:
-                    result = await self._api.send_key(tizen_key)
-                    
-                    if not result:
-                        _LOGGER.warning(
-                            f"Key {tizen_key} may have failed for button {self._button_id}"
-                        )
-                else:
-                    _LOGGER.error(
-                        f"Command '{key}' is not supported. "
-                        f"This command may only work with Tizen Local API."
-                    )
-                    
-        except Exception as e:
-            _LOGGER.error(f"Error pressing button '{self._button_id}': {e}")
+                _LOGGER.error(
+                    "Command '%s' is not supported. "
+                    "This command may only work with Tizen Local API.",
+                    key,
+                )
 
 
 class SamsungTizenButton(ButtonEntity):
@@ -164,37 +157,30 @@ class SamsungTizenButton(ButtonEntity):
         hass: HomeAssistant,
         host: str,
         name: str,
-        button_id: str,
-        button_config: dict,
+        button: tuple[str, str, str, str],
+        identifier: str,
     ):
         """Initialize the button."""
         self._hass = hass
         self._host = host
         self._name = name
-        self._button_id = button_id
-        self._button_config = button_config
+        self._button_id, button_name, self._attr_icon, key = button
+        self._tizen_key = TIZEN_KEYS.get(key.upper(), key)
         
-        self._attr_name = f"{name} {button_config['name']}"
-        self._attr_unique_id = f"{DOMAIN}_{host}_{button_id}"
-        self._attr_icon = button_config.get("icon")
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, self._host)},
-            "name": self._name,
-            "manufacturer": "Samsung",
-            "model": "Smart TV (Local)",
-        }
+        self._attr_name = f"{name} {button_name}"
+        self._attr_unique_id = f"{DOMAIN}_{identifier}_{self._button_id}"
+        self._attr_device_info = device_info(
+            identifier, name, "Smart TV (Local)"
+        )
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        key = self._button_config["key"]
-        tizen_key = TIZEN_KEYS.get(key.upper(), key)
+        tizen_key = self._tizen_key
         
         _LOGGER.debug(
-            f"Button '{self._button_id}' pressed, would send local key '{tizen_key}'"
+            "Button '%s' pressed, would send local key '%s'",
+            self._button_id,
+            tizen_key,
         )
         
         # TODO: Implement local Tizen WebSocket connection
@@ -1,19 +1,56 @@
 """Config flow for Samsung Remote integration."""
+import asyncio
+import hashlib
+import ipaddress
 import logging
+import time
+import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_NAME
 from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_entry_oauth2_flow
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.device_registry import format_mac
 
-from .const import DOMAIN
+from .api.tizen_local import TizenLocalAPI
+from .const import DATA_DEVICES_CACHE, DEVICE_CACHE_TTL, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
 CONNECTION_METHOD_SMARTTHINGS = "smartthings"
 CONNECTION_METHOD_LOCAL = "local"
 
+# Obergrenzen für das Auflisten der SmartThings Geräte (über alle Seiten)
+DEVICE_LIST_TIMEOUT = 10
+MAX_DEVICE_PAGES = 20
+
+SMARTTHINGS_SETUP_INSTRUCTIONS = (
+    "SmartThings integration not found!\n\n"
+    "Please set up the native SmartThings integration first:\n"
+    "1. Go to Settings > Devices & Services\n"
+    "2. Click 'Add Integration'\n"
+    "3. Search for 'SmartThings'\n"
+    "4. Complete the OAuth setup\n"
+    "5. Then return here to add Samsung Remote"
+)
+
+STEP_USER_DATA_SCHEMA = vol.Schema({
+    vol.Required("connection_method", default=CONNECTION_METHOD_SMARTTHINGS): vol.In({
+        CONNECTION_METHOD_SMARTTHINGS: "SmartThings API (Recommended - Cloud-based)",
+        CONNECTION_METHOD_LOCAL: "Local Tizen (Fallback - Direct network)"
+    })
+})
+
+STEP_LOCAL_DATA_SCHEMA = vol.Schema({
+    vol.Required(CONF_HOST): str,
+    vol.Optional(CONF_NAME, default="Samsung TV"): str,
+})
+
+EMPTY_SCHEMA = vol.Schema({})
+
 
 class SamsungRemoteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Samsung Remote."""
@@ -25,6 +62,10 @@ class SamsungRemoteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self.connection_method = None
         self.device_id = None
         self.device_name = None
+        self._devices = None
+        self._devices_by_id = {}
+        self._device_schema = None
+        self._smartthings_token = None
 
     async def async_step_user(self, user_input=None):
         """Handle the initial step - choose connection method."""
@@ -38,12 +79,7 @@ class SamsungRemoteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema({
-                vol.Required("connection_method", default=CONNECTION_METHOD_SMARTTHINGS): vol.In({
-                    CONNECTION_METHOD_SMARTTHINGS: "SmartThings API (Recommended - Cloud-based)",
-                    CONNECTION_METHOD_LOCAL: "Local Tizen (Fallback - Direct network)"
-                })
-            }),
+            data_schema=STEP_USER_DATA_SCHEMA,
             description_placeholders={
                 "info": "SmartThings API requires the native SmartThings integration to be configured first."
             }
@@ -60,80 +96,81 @@ class SamsungRemoteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors["base"] = "smartthings_not_configured"
             return self.async_show_form(
                 step_id="smartthings",
-                data_schema=vol.Schema({}),
+                data_schema=EMPTY_SCHEMA,
                 errors=errors,
                 description_placeholders={
-                    "error_info": (
-                        "SmartThings integration not found!\n\n"
-                        "Please set up the native SmartThings integration first:\n"
-                        "1. Go to Settings > Devices & Services\n"
-                        "2. Click 'Add Integration'\n"
-                        "3. Search for 'SmartThings'\n"
-                        "4. Complete the OAuth setup\n"
-                        "5. Then return here to add Samsung Remote"
-                    )
+                    "error_info": SMARTTHINGS_SETUP_INSTRUCTIONS
                 }
             )
 
-        if user_input is not None:
-            # Hole die verfügbaren Samsung TVs aus SmartThings
-            try:
-                devices = await self._get_smartthings_devices()
-                
-                if not devices:
-                    errors["base"] = "no_devices"
-                    return self.async_show_form(
-                        step_id="smartthings",
-                        data_schema=vol.Schema({
-                            vol.Required("refresh"): bool
-                        }),
-                        errors=errors,
-                        description_placeholders={
-                            "info": "No Samsung TVs found in your SmartThings account."
-                        }
-                    )
-                
-                self.device_id = user_input.get("device_id")
-                self.device_name = user_input.get("device_name")
-                
-                if self.device_id:
-                    # Erstelle den Config Entry
-                    return self.async_create_entry(
-                        title=self.device_name or "Samsung TV",
-                        data={
-                            "connection_method": CONNECTION_METHOD_SMARTTHINGS,
-                            "device_id": self.device_id,
-                            "device_name": self.device_name,
-                        }
-                    )
-                    
-            except Exception as e:
-                _LOGGER.exception("Error setting up SmartThings connection")
-                errors["base"] = "cannot_connect"
+        # Eingaben einmal auslesen statt in jedem Zweig erneut
+        device_id = user_input.get("device_id") if user_input else None
+
+        if device_id:
+            # Bereits konfigurierte TVs abbrechen, bevor die API abgefragt wird
+            await self.async_set_unique_id(device_id)
+            self._abort_if_unique_id_configured()
+
+        # Hole die verfügbaren Samsung TVs aus SmartThings (einmal pro Schritt)
+        try:
+            devices = await self._get_smartthings_devices()
+        except InvalidAuth:
+            # Beim nächsten Versuch ein eventuell erneuertes Token lesen
+            self._smartthings_token = None
+            errors["base"] = "invalid_auth"
+        except CannotConnect:
+            errors["base"] = "cannot_connect"
+        except Exception:
+            _LOGGER.exception("Unexpected error getting SmartThings devices")
+            errors["base"] = "unknown"
+
+        if errors:
+            return self.async_show_form(
+                step_id="smartthings",
+                data_schema=EMPTY_SCHEMA,
+                errors=errors,
+            )
+
+        if devices is not self._devices:
+            # Index und Auswahl-Schema nur bei einer neuen Geräteliste neu bauen
+            self._devices = devices
+            self._devices_by_id = {device["deviceId"]: device for device in devices}
+            self._device_schema = vol.Schema({
+                vol.Required("device_id"): vol.In({
+                    device_id: f"{device['label']} ({device_id})"
+                    for device_id, device in self._devices_by_id.items()
+                }),
+            })
 
-        # Hole die verfügbaren Geräte
-        devices = await self._get_smartthings_devices()
-        
         if not devices:
             return self.async_show_form(
                 step_id="smartthings",
-                data_schema=vol.Schema({}),
+                data_schema=EMPTY_SCHEMA,
                 errors={"base": "no_devices"},
                 description_placeholders={
                     "info": "No Samsung TVs found. Make sure your TV is added to SmartThings."
                 }
             )
 
-        device_schema = vol.Schema({
-            vol.Required("device_id"): vol.In({
-                device["deviceId"]: f"{device['label']} ({device['deviceId']})"
-                for device in devices
-            }),
-        })
+        if device_id:
+            self.device_id = device_id
+            self.device_name = user_input.get("device_name") or (
+                self._devices_by_id.get(device_id, {}).get("label")
+            )
+            
+            # Erstelle den Config Entry
+            return self.async_create_entry(
+                title=self.device_name or "Samsung TV",
+                data={
+                    "connection_method": CONNECTION_METHOD_SMARTTHINGS,
+                    "device_id": device_id,
+                    "device_name": self.device_name,
+                }
+            )
 
         return self.async_show_form(
             step_id="smartthings",
-            data_schema=device_schema,
+            data_schema=self._device_schema,
             errors=errors,
             description_placeholders={
                 "info": "Select your Samsung TV from the list of SmartThings devices."
@@ -145,114 +182,202 @@ class SamsungRemoteConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
 
         if user_input is not None:
-            host = user_input[CONF_HOST]
-            name = user_input.get(CONF_NAME, "Samsung TV")
+            host = user_input[CONF_HOST].strip()
+            # Das Schema setzt den Default, ein zweites Fallback ist unnötig
+            name = user_input[CONF_NAME]
 
-            # Prüfe ob die IP bereits konfiguriert ist
+            # Ungültige IP-Adressen ohne Netzwerkzugriff ablehnen
+            try:
+                ipaddress.ip_address(host)
+            except ValueError:
+                errors["base"] = "invalid_ip"
+
+        if user_input is not None and not errors:
+            # Prüfe ob die IP bereits konfiguriert ist; per MAC angelegte
+            # Einträge findet nur der Abgleich über die gespeicherten Daten
+            self._async_abort_entries_match({CONF_HOST: host})
             await self.async_set_unique_id(host)
-            self._abort_if_unique_id_configured()
 
-            # TODO: Teste die Verbindung zum TV
-            # For now, we'll just create the entry
-            
-            return self.async_create_entry(
-                title=name,
-                data={
-                    "connection_method": CONNECTION_METHOD_LOCAL,
-                    CONF_HOST: host,
-                    CONF_NAME: name,
-                }
-            )
+            # Teste die Verbindung zum TV (das Timeout setzt der Client)
+            api = TizenLocalAPI(self.hass, host)
+            connected, mac = await api.validate_connection()
+
+            if connected:
+                # Die MAC bleibt bei DHCP-Wechseln gleich; die IP wird nur aktualisiert
+                if mac:
+                    await self.async_set_unique_id(format_mac(mac))
+                    self._abort_if_unique_id_configured(updates={CONF_HOST: host})
+
+                return self.async_create_entry(
+                    title=name,
+                    data={
+                        "connection_method": CONNECTION_METHOD_LOCAL,
+                        CONF_HOST: host,
+                        CONF_NAME: name,
+                    }
+                )
+
+            errors["base"] = "cannot_connect"
 
         return self.async_show_form(
             step_id="local",
-            data_schema=vol.Schema({
-                vol.Required(CONF_HOST): str,
-                vol.Optional(CONF_NAME, default="Samsung TV"): str,
-            }),
+            data_schema=STEP_LOCAL_DATA_SCHEMA,
             errors=errors,
             description_placeholders={
                 "info": "Enter your TV's IP address. You can find this in your TV's network settings."
             }
         )
 
-    async def _get_smartthings_devices(self):
-        """Get Samsung TV devices from SmartThings."""
-        try:
-            # Hole die SmartThings Integration
-            smartthings_entries = self.hass.config_entries.async_entries("smartthings")
-            
-            if not smartthings_entries:
-                _LOGGER.error("No SmartThings integration configured")
-                return []
-            
-            # Hole das erste SmartThings Entry
-            st_entry = smartthings_entries[0]
-            
-            # Versuche das Token zu bekommen
-            token = None
-            
-            if "token" in st_entry.data:
-                token_data = st_entry.data["token"]
-                if isinstance(token_data, dict):
-                    token = token_data.get("access_token")
-            elif "access_token" in st_entry.data:
-                token = st_entry.data["access_token"]
-            
-            # Wenn kein Token, versuche OAuth2 Session
-            if not token:
-                try:
-                    implementation = await config_entry_oauth2_flow.async_get_implementation(
-                        self.hass, "smartthings"
+    async def _get_smartthings_token(self):
+        """Get the SmartThings access token, cached for the flow's lifetime."""
+        if self._smartthings_token:
+            return self._smartthings_token
+
+        # Hole die SmartThings Integration
+        smartthings_entries = self.hass.config_entries.async_entries("smartthings")
+        
+        if not smartthings_entries:
+            _LOGGER.error("No SmartThings integration configured")
+            return None
+        
+        # Hole das erste SmartThings Entry
+        st_entry = smartthings_entries[0]
+        
+        # Versuche das Token zu bekommen
+        token = None
+        
+        if "token" in st_entry.data:
+            token_data = st_entry.data["token"]
+            if isinstance(token_data, dict):
+                token = token_data.get("access_token")
+        elif "access_token" in st_entry.data:
+            token = st_entry.data["access_token"]
+        
+        # Wenn kein Token, versuche OAuth2 Session; sie liest die Token-Daten
+        # aus dem Entry und braucht deshalb ein "token"-Dict
+        if not token and isinstance(st_entry.data.get("token"), dict):
+            try:
+                implementation = await config_entry_oauth2_flow.async_get_implementation(
+                    self.hass, "smartthings"
+                )
+                
+                if implementation:
+                    session = config_entry_oauth2_flow.OAuth2Session(
+                        self.hass, st_entry, implementation
                     )
                     
-                    if implementation:
-                        session = config_entry_oauth2_flow.OAuth2Session(
-                            self.hass, st_entry, implementation
-                        )
-                        
-                        token_data = await session.async_ensure_token_valid()
-                        if token_data:
-                            token = token_data.get("access_token")
-                except Exception as e:
-                    _LOGGER.error(f"Failed to get OAuth token: {e}")
-            
-            if not token:
-                _LOGGER.error("Could not retrieve SmartThings token")
-                return []
-            
-            # Importiere die SmartThings API
-            import aiohttp
+                    token_data = await session.async_ensure_token_valid()
+                    if token_data:
+                        token = token_data.get("access_token")
+            except (
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                HomeAssistantError,
+                KeyError,
+                ValueError,
+            ) as e:
+                _LOGGER.error("Failed to get OAuth token: %s", e)
+        
+        self._smartthings_token = token
+        return token
+
+    async def _get_smartthings_devices(self):
+        """Get Samsung TV devices from SmartThings.
+
+        Raises InvalidAuth if SmartThings rejects the token and
+        CannotConnect if SmartThings cannot be reached.
+        """
+        token = await self._get_smartthings_token()
+        
+        if not token:
+            _LOGGER.error("Could not retrieve SmartThings token")
+            return []
+        
+        # Kürzlich geladene Geräteliste wiederverwenden (z.B. für den zweiten TV)
+        cache = self.hass.data.setdefault(DOMAIN, {}).setdefault(
+            DATA_DEVICES_CACHE, {}
+        )
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        cached = cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < DEVICE_CACHE_TTL:
+            return cached[1]
+        
+        # Filtere nur Samsung TVs und behalte nur die Felder, die der Flow braucht
+        # Ein Timeout für alle Seiten zusammen, nicht pro Seite
+        try:
+            async with asyncio.timeout(DEVICE_LIST_TIMEOUT):
+                tv_devices = [
+                    {
+                        "deviceId": device["deviceId"],
+                        "label": device.get("label", device["deviceId"]),
+                    }
+                    async for device in self._async_iter_smartthings_devices(token)
+                    if any(cap in device.get("capabilities", []) 
+                           for cap in ["mediaPlayback", "tvChannel", "audioVolume"])
+                ]
+        except TimeoutError as e:
+            _LOGGER.warning("Listing SmartThings devices timed out")
+            raise CannotConnect from e
+        
+        _LOGGER.info("Found %d Samsung TV(s)", len(tv_devices))
+        if tv_devices:
+            now = time.monotonic()
+            # Abgelaufene Einträge entfernen, jeder OAuth-Refresh bringt einen neuen Token
+            for stale in [
+                key for key, (stamp, _) in cache.items()
+                if now - stamp >= DEVICE_CACHE_TTL
+            ]:
+                del cache[stale]
+            cache[cache_key] = (now, tv_devices)
+        return tv_devices
+
+    async def _async_iter_smartthings_devices(self, token):
+        """Yield SmartThings devices page by page.
+
+        Follows the API's next links so accounts with more devices than fit
+        on one page are listed completely, without buffering every page.
+        Stops after MAX_DEVICE_PAGES pages or when a next link repeats; the
+        caller bounds the whole listing with DEVICE_LIST_TIMEOUT.
+        """
+        # Hole die Geräte über die geteilte Home Assistant Session
+        session = async_get_clientsession(self.hass)
+        url = "https://api.smartthings.com/v1/devices"
+        seen = set()
+        
+        while url:
+            if url in seen or len(seen) >= MAX_DEVICE_PAGES:
+                _LOGGER.warning(
+                    "Stopped listing SmartThings devices after %d pages", len(seen)
+                )
+                return
+            seen.add(url)
             
-            # Hole die Geräte
-            async with aiohttp.ClientSession() as session:
+            try:
                 async with session.get(
-                    "https://api.smartthings.com/v1/devices",
+                    url,
                     headers={
                         "Authorization": f"Bearer {token}",
                         "Accept": "application/json"
-                    }
+                    },
                 ) as response:
+                    if response.status in (401, 403):
+                        raise InvalidAuth
                     if response.status != 200:
-                        _LOGGER.error(f"Failed to get devices: {response.status}")
-                        return []
+                        _LOGGER.error("Failed to get devices: %s", response.status)
+                        raise CannotConnect
                     
                     data = await response.json()
-                    devices = data.get("items", [])
-                    
-                    # Filtere nur Samsung TVs
-                    tv_devices = [
-                        device for device in devices
-                        if any(cap in device.get("capabilities", []) 
-                               for cap in ["mediaPlayback", "tvChannel", "audioVolume"])
-                    ]
-                    
-                    _LOGGER.info(f"Found {len(tv_devices)} Samsung TV(s)")
-                    return tv_devices
-                    
-        except Exception as e:
-            _LOGGER.exception("Error getting SmartThings devices")
-            return []
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Erwartete Netzwerkfehler ohne Traceback loggen
+                _LOGGER.warning("Could not reach SmartThings: %s", e)
+                raise CannotConnect from e
+            
+            for device in data.get("items", []):
+                yield device
+            
+            # Die letzte Seite liefert keinen (oder einen leeren) next-Link
+            next_link = (data.get("_links") or {}).get("next") or {}
+            url = next_link.get("href")
 
     @staticmethod
     @callback
@@ -267,15 +392,15 @@ class SamsungRemoteOptionsFlow(config_entries.OptionsFlow):
     def __init__(self, config_entry):
         """Initialize options flow."""
         self.config_entry = config_entry
+        # Die Verbindungsart ändert sich nicht, einmal beim Start auslesen
+        self._connection_method = config_entry.data.get("connection_method")
 
     async def async_step_init(self, user_input=None):
         """Manage the options."""
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
-        connection_method = self.config_entry.data.get("connection_method")
-        
-        if connection_method == CONNECTION_METHOD_SMARTTHINGS:
+        if self._connection_method == CONNECTION_METHOD_SMARTTHINGS:
             # SmartThings Options
             return self.async_show_form(
                 step_id="init",
@@ -297,3 +422,11 @@ class SamsungRemoteOptionsFlow(config_entries.OptionsFlow):
                     ): int,
                 })
             )
+
+
+class InvalidAuth(HomeAssistantError):
+    """Error to indicate SmartThings rejected the access token."""
+
+
+class CannotConnect(HomeAssistantError):
+    """Error to indicate SmartThings could not be reached."""
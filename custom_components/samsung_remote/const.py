@@ -30,6 +30,10 @@ DEFAULT_NAME = "Samsung TV"
 DEFAULT_PORT = 8001
 DEFAULT_TIMEOUT = 3
 
+# SmartThings device list cache (hass.data[DOMAIN])
+DATA_DEVICES_CACHE = "devices_cache"
+DEVICE_CACHE_TTL = 60
+
 # Supported commands mapping
 SMARTTHINGS_COMMANDS = {
     # Navigation
@@ -0,0 +1,14 @@
+"""Shared entity helpers for Samsung Remote integration."""
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from .const import DOMAIN
+
+
+def device_info(identifier: str, name: str, model: str) -> DeviceInfo:
+    """Return the device info for one TV."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, identifier)},
+        name=name,
+        manufacturer="Samsung",
+        model=model,
+    )
@@ -15,6 +15,7 @@ from .const import (
     CONF_DEVICE_NAME,
 )
 from .api.smartthings import SmartThingsAPI
+from .entity import device_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,7 +40,7 @@ async def async_setup_entry(
         # Local Tizen implementation
         host = entry.data["host"]
         name = entry.data.get("name", "Samsung TV")
-        remote = SamsungTizenRemote(hass, host, name)
+        remote = SamsungTizenRemote(hass, host, name, entry.unique_id or host)
     
     async_add_entities([remote])
 
@@ -61,6 +62,7 @@ class SamsungSmartThingsRemote(RemoteEntity):
         self._api = SmartThingsAPI(hass, device_id, access_token)
         self._is_on = True
         self._attr_unique_id = f"{DOMAIN}_{device_id}"
+        self._attr_device_info = device_info(device_id, device_name, "Smart TV")
 
     @property
     def name(self) -> str:
@@ -72,17 +74,6 @@ class SamsungSmartThingsRemote(RemoteEntity):
         """Return True if the remote is on."""
         return self._is_on
 
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": self._name,
-            "manufacturer": "Samsung",
-            "model": "Smart TV",
-            "via_device": (DOMAIN, self._device_id),
-        }
-
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the remote on."""
         self._is_on = True
@@ -96,19 +87,19 @@ class SamsungSmartThingsRemote(RemoteEntity):
 
     async def async_send_command(self, command: Iterable[str], **kwargs: Any) -> None:
         """Send a command to the TV."""
-        _LOGGER.debug(f"Sending commands: {command}")
+        _LOGGER.debug("Sending commands: %s", command)
         
         for cmd in command:
             try:
                 result = await self._api.send_command(cmd)
                 
                 if result:
-                    _LOGGER.info(f"Successfully sent command: {cmd}")
+                    _LOGGER.info("Successfully sent command: %s", cmd)
                 else:
-                    _LOGGER.warning(f"Command '{cmd}' may have failed")
+                    _LOGGER.warning("Command '%s' may have failed", cmd)
                     
             except Exception as e:
-                _LOGGER.error(f"Error sending command '{cmd}': {e}")
+                _LOGGER.error("Error sending command '%s': %s", cmd, e)
 
     async def async_update(self) -> None:
         """Update the remote state."""
@@ -120,19 +111,26 @@ class SamsungSmartThingsRemote(RemoteEntity):
                 self._is_on = True
             
         except Exception as e:
-            _LOGGER.debug(f"Failed to update remote state: {e}")
+            _LOGGER.debug("Failed to update remote state: %s", e)
 
 
 class SamsungTizenRemote(RemoteEntity):
     """Representation of a Samsung TV remote using local Tizen API."""
 
-    def __init__(self, hass: HomeAssistant, host: str, name: str):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        host: str,
+        name: str,
+        identifier: str,
+    ):
         """Initialize the remote."""
         self._hass = hass
         self._host = host
         self._name = name
         self._is_on = True
-        self._attr_unique_id = f"{DOMAIN}_{host}"
+        self._attr_unique_id = f"{DOMAIN}_{identifier}"
+        self._attr_device_info = device_info(identifier, name, "Smart TV (Local)")
 
     @property
     def name(self) -> str:
@@ -144,16 +142,6 @@ class SamsungTizenRemote(RemoteEntity):
         """Return True if the remote is on."""
         return self._is_on
 
-    @property
-    def device_info(self):
-        """Return device information."""
-        return {
-            "identifiers": {(DOMAIN, self._host)},
-            "name": self._name,
-            "manufacturer": "Samsung",
-            "model": "Smart TV (Local)",
-        }
-
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the remote on."""
         await self.async_send_command(["POWER"])
@@ -164,7 +152,7 @@ class SamsungTizenRemote(RemoteEntity):
 
     async def async_send_command(self, command: Iterable[str], **kwargs: Any) -> None:
         """Send a command to the TV."""
-        _LOGGER.debug(f"Sending local commands: {command}")
+        _LOGGER.debug("Sending local commands: %s", command)
         
         # TODO: Implement local Tizen WebSocket connection
         # For now, log that local is not fully implemented
@@ -174,7 +162,7 @@ class SamsungTizenRemote(RemoteEntity):
         )
         
         for cmd in command:
-            _LOGGER.info(f"Would send local command: {cmd}")
+            _LOGGER.info("Would send local command: %s", cmd)
 
     async def async_update(self) -> None:
         """Update the remote state."""
@@ -24,7 +24,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             return
         
         if DOMAIN not in hass.data or entry_id not in hass.data[DOMAIN]:
-            LOGGER.error(f"Entry {entry_id} not found")
+            LOGGER.error("Entry %s not found", entry_id)
             return
         
         api = hass.data[DOMAIN][entry_id].get("api")
@@ -39,7 +39,7 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             else:
                 LOGGER.error("Failed to refresh SmartThings token - check your refresh token configuration")
         except Exception as e:
-            LOGGER.error(f"Error refreshing token: {e}")
+            LOGGER.error("Error refreshing token: %s", e)
 
     hass.services.async_register(
         DOMAIN,
@@ -0,0 +1,40 @@
+"""Tests for button entities."""
+
+from unittest.mock import MagicMock, patch
+
+from custom_components.samsung_remote.button import (
+    SamsungSmartThingsButton,
+    SamsungTizenButton,
+)
+from custom_components.samsung_remote.const import DOMAIN
+
+POWER_BUTTON = ("power", "Power", "mdi:power", "POWER")
+
+
+def test_smartthings_button_attributes():
+    """Test the SmartThings button sets Home Assistant's _attr_* fields."""
+    with patch(
+        "custom_components.samsung_remote.api.smartthings.async_get_clientsession"
+    ):
+        button = SamsungSmartThingsButton(
+            MagicMock(), "device-123", "Living Room TV", POWER_BUTTON
+        )
+
+    assert button.name == "Living Room TV Power"
+    assert button.icon == "mdi:power"
+    assert button.unique_id == f"{DOMAIN}_device-123_power"
+    assert button.device_info["identifiers"] == {(DOMAIN, "device-123")}
+    assert button._tizen_key == "KEY_POWER"
+
+
+def test_tizen_button_attributes_keyed_on_identifier():
+    """Test the Tizen button keys its IDs on the entry identifier."""
+    button = SamsungTizenButton(
+        MagicMock(), "192.168.1.100", "Bedroom TV", POWER_BUTTON, "aa:bb:cc:dd:ee:ff"
+    )
+
+    assert button.name == "Bedroom TV Power"
+    assert button.icon == "mdi:power"
+    assert button.unique_id == f"{DOMAIN}_aa:bb:cc:dd:ee:ff_power"
+    assert button.device_info["identifiers"] == {(DOMAIN, "aa:bb:cc:dd:ee:ff")}
+    assert button._host == "192.168.1.100"
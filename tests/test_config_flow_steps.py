@@ -0,0 +1,321 @@
+"""Tests for the config flow steps."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+import pytest
+from homeassistant.const import CONF_HOST, CONF_NAME
+from homeassistant.data_entry_flow import AbortFlow
+
+from custom_components.samsung_remote.config_flow import SamsungRemoteConfigFlow
+from custom_components.samsung_remote.const import (
+    DATA_DEVICES_CACHE,
+    DEVICE_CACHE_TTL,
+    DOMAIN,
+)
+
+TV_CAPABILITIES = ["mediaPlayback", "audioVolume"]
+
+
+def _make_flow(hass=None):
+    """Return a config flow bound to a mocked Home Assistant instance."""
+    if hass is None:
+        hass = MagicMock()
+        hass.data = {}
+        st_entry = MagicMock()
+        st_entry.data = {"token": {"access_token": "test-token"}}
+        hass.config_entries.async_entries.return_value = [st_entry]
+
+    flow = SamsungRemoteConfigFlow()
+    flow.hass = hass
+    return flow
+
+
+def _response(status, data=None):
+    """Return a mocked ``session.get`` context manager."""
+    response = MagicMock()
+    response.status = status
+    response.json = AsyncMock(return_value=data)
+
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=response)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return context
+
+
+def _patch_session(session):
+    """Patch the shared aiohttp session used by the config flow."""
+    return patch(
+        "custom_components.samsung_remote.config_flow.async_get_clientsession",
+        return_value=session,
+    )
+
+
+@pytest.mark.asyncio
+async def test_smartthings_lists_tvs_across_pages():
+    """Test the device listing follows next links and keeps only TVs."""
+    flow = _make_flow()
+    session = MagicMock()
+    session.get.side_effect = [
+        _response(200, {
+            "items": [
+                {"deviceId": "tv-1", "label": "Living Room", "capabilities": TV_CAPABILITIES},
+            ],
+            "_links": {"next": {"href": "https://api.smartthings.com/v1/devices?page=1"}},
+        }),
+        _response(200, {
+            "items": [
+                {"deviceId": "tv-2", "label": "Bedroom", "capabilities": TV_CAPABILITIES},
+                {"deviceId": "lamp", "label": "Lamp", "capabilities": ["switch"]},
+            ],
+            "_links": {"next": None},
+        }),
+    ]
+
+    with _patch_session(session):
+        result = await flow.async_step_smartthings()
+
+    assert result["type"] == "form"
+    assert result["step_id"] == "smartthings"
+    assert set(flow._devices_by_id) == {"tv-1", "tv-2"}
+    assert session.get.call_count == 2
+    assert session.get.call_args_list[1].args[0].endswith("?page=1")
+
+
+@pytest.mark.asyncio
+async def test_smartthings_stops_on_repeated_next_link():
+    """Test a next link pointing back to a listed page ends the listing."""
+    flow = _make_flow()
+    session = MagicMock()
+    session.get.return_value = _response(200, {
+        "items": [
+            {"deviceId": "tv-1", "label": "Living Room", "capabilities": TV_CAPABILITIES},
+        ],
+        "_links": {"next": {"href": "https://api.smartthings.com/v1/devices?page=1"}},
+    })
+
+    with _patch_session(session):
+        result = await flow.async_step_smartthings()
+
+    assert result["step_id"] == "smartthings"
+    assert session.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_smartthings_listing_timeout_is_cannot_connect():
+    """Test a listing exceeding the overall timeout is reported as cannot_connect."""
+    flow = _make_flow()
+    session = MagicMock()
+    slow_page = _response(200)
+
+    async def _slow_json():
+        await asyncio.sleep(1)
+
+    slow_page.__aenter__.return_value.json = AsyncMock(side_effect=_slow_json)
+    session.get.return_value = slow_page
+
+    with _patch_session(session), patch(
+        "custom_components.samsung_remote.config_flow.DEVICE_LIST_TIMEOUT", 0.01
+    ):
+        result = await flow.async_step_smartthings()
+
+    assert result["errors"] == {"base": "cannot_connect"}
+
+
+@pytest.mark.asyncio
+async def test_smartthings_reuses_cached_devices():
+    """Test a second flow for the same token is served from the cache."""
+    flow = _make_flow()
+    session = MagicMock()
+    session.get.return_value = _response(200, {
+        "items": [
+            {"deviceId": "tv-1", "label": "Living Room", "capabilities": TV_CAPABILITIES},
+        ],
+    })
+
+    with _patch_session(session):
+        await flow.async_step_smartthings()
+        second = _make_flow(flow.hass)
+        await second.async_step_smartthings()
+
+    assert session.get.call_count == 1
+    assert set(second._devices_by_id) == {"tv-1"}
+
+
+@pytest.mark.asyncio
+async def test_smartthings_cache_prunes_expired_tokens():
+    """Test writing the cache drops entries of expired (refreshed) tokens."""
+    flow = _make_flow()
+    flow.hass.data[DOMAIN] = {
+        DATA_DEVICES_CACHE: {
+            "old-token-hash": (time.monotonic() - DEVICE_CACHE_TTL - 1, []),
+        }
+    }
+    session = MagicMock()
+    session.get.return_value = _response(200, {
+        "items": [
+            {"deviceId": "tv-1", "label": "Living Room", "capabilities": TV_CAPABILITIES},
+        ],
+    })
+
+    with _patch_session(session):
+        await flow.async_step_smartthings()
+
+    cache = flow.hass.data[DOMAIN][DATA_DEVICES_CACHE]
+    assert "old-token-hash" not in cache
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_smartthings_rejected_token_is_invalid_auth():
+    """Test a 401 from SmartThings is reported as invalid_auth."""
+    flow = _make_flow()
+    session = MagicMock()
+    session.get.return_value = _response(401)
+
+    with _patch_session(session):
+        result = await flow.async_step_smartthings()
+
+    assert result["errors"] == {"base": "invalid_auth"}
+
+
+@pytest.mark.asyncio
+async def test_smartthings_client_error_is_cannot_connect():
+    """Test a network error is reported as cannot_connect."""
+    flow = _make_flow()
+    session = MagicMock()
+    session.get.side_effect = aiohttp.ClientConnectionError("unreachable")
+
+    with _patch_session(session):
+        result = await flow.async_step_smartthings()
+
+    assert result["errors"] == {"base": "cannot_connect"}
+
+
+@pytest.mark.asyncio
+async def test_smartthings_unexpected_error_is_unknown():
+    """Test an unexpected error is reported as unknown."""
+    flow = _make_flow()
+    session = MagicMock()
+    session.get.side_effect = RuntimeError("boom")
+
+    with _patch_session(session):
+        result = await flow.async_step_smartthings()
+
+    assert result["errors"] == {"base": "unknown"}
+
+
+@pytest.mark.asyncio
+async def test_local_malformed_host_is_invalid_ip():
+    """Test a malformed host is rejected without probing the TV."""
+    flow = _make_flow()
+
+    with patch(
+        "custom_components.samsung_remote.config_flow.TizenLocalAPI"
+    ) as mock_api_class:
+        result = await flow.async_step_local(
+            {CONF_HOST: "192.168.1", CONF_NAME: "Samsung TV"}
+        )
+
+    assert result["type"] == "form"
+    assert result["errors"] == {"base": "invalid_ip"}
+    mock_api_class.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_local_ipv6_host_is_probed_with_brackets():
+    """Test an IPv6 host reaches the TV through a bracketed URL."""
+    flow = _make_flow()
+    flow.async_set_unique_id = AsyncMock()
+    flow._async_abort_entries_match = MagicMock()
+    flow.async_create_entry = MagicMock(return_value={"type": "create_entry"})
+    session = MagicMock()
+    session.get.return_value = _response(200, {"device": {}})
+
+    with patch(
+        "custom_components.samsung_remote.api.tizen_local.async_get_clientsession",
+        return_value=session,
+    ):
+        result = await flow.async_step_local(
+            {CONF_HOST: "2001:db8::5", CONF_NAME: "Samsung TV"}
+        )
+
+    assert result["type"] == "create_entry"
+    assert str(session.get.call_args.args[0]) == "http://[2001:db8::5]:8001/api/v2/"
+
+
+@pytest.mark.asyncio
+async def test_local_updates_host_of_entry_with_same_mac():
+    """Test a TV known by its MAC gets its new IP instead of a second entry."""
+    flow = _make_flow()
+    flow.async_set_unique_id = AsyncMock()
+    flow._async_abort_entries_match = MagicMock()
+    flow._abort_if_unique_id_configured = MagicMock(
+        side_effect=AbortFlow("already_configured")
+    )
+
+    with patch(
+        "custom_components.samsung_remote.config_flow.TizenLocalAPI"
+    ) as mock_api_class:
+        mock_api_class.return_value.validate_connection = AsyncMock(
+            return_value=(True, "AA:BB:CC:DD:EE:FF")
+        )
+
+        with pytest.raises(AbortFlow):
+            await flow.async_step_local(
+                {CONF_HOST: "192.168.1.101", CONF_NAME: "Samsung TV"}
+            )
+
+    flow.async_set_unique_id.assert_called_with("aa:bb:cc:dd:ee:ff")
+    flow._abort_if_unique_id_configured.assert_called_once_with(
+        updates={CONF_HOST: "192.168.1.101"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_known_host_aborts_before_probe():
+    """Test re-adding a configured IP aborts without touching the network."""
+    flow = _make_flow()
+    flow._async_abort_entries_match = MagicMock(
+        side_effect=AbortFlow("already_configured")
+    )
+
+    with patch(
+        "custom_components.samsung_remote.config_flow.TizenLocalAPI"
+    ) as mock_api_class:
+        with pytest.raises(AbortFlow):
+            await flow.async_step_local(
+                {CONF_HOST: "192.168.1.100", CONF_NAME: "Samsung TV"}
+            )
+
+    flow._async_abort_entries_match.assert_called_once_with(
+        {CONF_HOST: "192.168.1.100"}
+    )
+    mock_api_class.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_token_without_oauth_data_skips_session():
+    """Test an entry without token data degrades to no token, not an error."""
+    flow = _make_flow()
+    st_entry = MagicMock()
+    st_entry.data = {}
+    flow.hass.config_entries.async_entries.return_value = [st_entry]
+
+    with patch(
+        "custom_components.samsung_remote.config_flow.config_entry_oauth2_flow"
+    ) as mock_oauth:
+        assert await flow._get_smartthings_token() is None
+
+    mock_oauth.OAuth2Session.assert_not_called()
+
+
+def test_flow_initial_state():
+    """Test the config flow initializes its own state."""
+    flow = _make_flow()
+
+    assert flow._devices is None
+    assert flow._devices_by_id == {}
+    assert flow._smartthings_token is None
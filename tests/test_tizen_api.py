@@ -1,60 +1,109 @@
 """Tests for Tizen local API client."""
 
+import logging
 from unittest.mock import AsyncMock, patch, MagicMock
 
+import aiohttp
 import pytest
 
-from custom_components.samsung_remote.api.tizen_local import TizenLocalAPI
+from custom_components.samsung_remote.api.tizen_local import TizenLocalAPI, _TokenBucket
 
 
 @pytest.mark.asyncio
-async def test_tizen_validate_connection_success():
+async def test_tizen_validate_connection_success(hass):
     """Test successful connection validation."""
-    api = TizenLocalAPI("192.168.1.100")
+    api = TizenLocalAPI(hass, "192.168.1.100")
     
     with patch("aiohttp.ClientSession.get") as mock_get:
         mock_response = AsyncMock()
         mock_response.status = 200
+        mock_response.json = AsyncMock(
+            return_value={"device": {"wifiMac": "AA:BB:CC:DD:EE:FF"}}
+        )
         mock_get.return_value.__aenter__.return_value = mock_response
         
         result = await api.validate_connection()
-        assert result is True
+        assert result == (True, "AA:BB:CC:DD:EE:FF")
+        mock_get.assert_called_once()
 
 
 @pytest.mark.asyncio
-async def test_tizen_validate_connection_failure():
+async def test_tizen_validate_connection_failure(hass):
     """Test failed connection validation."""
-    api = TizenLocalAPI("192.168.1.100")
+    api = TizenLocalAPI(hass, "192.168.1.100")
     
     with patch("aiohttp.ClientSession.get") as mock_get:
-        mock_get.side_effect = Exception("Connection refused")
+        mock_get.side_effect = aiohttp.ClientConnectionError("Connection refused")
         result = await api.validate_connection()
-        assert result is False
+        assert result == (False, None)
 
 
 @pytest.mark.asyncio
-async def test_tizen_send_command():
+async def test_tizen_validate_connection_without_device_info(hass):
+    """Test a TV answering with a non-object body is reachable without a MAC."""
+    api = TizenLocalAPI(hass, "192.168.1.100")
+    
+    with patch("aiohttp.ClientSession.get") as mock_get:
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.json = AsyncMock(return_value=["unexpected"])
+        mock_get.return_value.__aenter__.return_value = mock_response
+        
+        assert await api.validate_connection() == (True, None)
+
+
+@pytest.mark.asyncio
+async def test_tizen_send_command(hass, caplog):
     """Test sending command."""
-    api = TizenLocalAPI("192.168.1.100")
+    api = TizenLocalAPI(hass, "192.168.1.100")
+    caplog.set_level(logging.DEBUG)
     
-    result = await api.send_command("POWER")
+    result = await api.send_command("device-123", "POWER")
     assert result is True
+    assert "Sending command KEY_POWER to TV at 192.168.1.100" in caplog.text
 
 
 @pytest.mark.asyncio
-async def test_tizen_send_command_with_psk():
+async def test_tizen_send_command_with_psk(hass, caplog):
     """Test sending command with PSK."""
-    api = TizenLocalAPI("192.168.1.100", psk="test-psk")
+    api = TizenLocalAPI(hass, "192.168.1.100", psk="test-psk")
+    caplog.set_level(logging.DEBUG)
     
-    result = await api.send_command("VOLUME_UP")
+    result = await api.send_command("device-123", "VOLUME_UP")
     assert result is True
+    assert "Sending command KEY_VOLUP to TV at 192.168.1.100" in caplog.text
 
 
 @pytest.mark.asyncio
-async def test_tizen_close_session():
+async def test_tizen_send_command_raw_skips_key_lookup(hass):
+    """Test raw key codes are sent without consulting TIZEN_KEYS."""
+    api = TizenLocalAPI(hass, "192.168.1.100")
+    
+    with patch(
+        "custom_components.samsung_remote.api.tizen_local.TIZEN_KEYS"
+    ) as mock_keys:
+        assert await api.send_command("device-123", "KEY_POWER", raw=True) is True
+        mock_keys.get.assert_not_called()
+        
+        await api.send_command("device-123", "POWER")
+        mock_keys.get.assert_called_once_with("POWER", "POWER")
+
+
+@pytest.mark.asyncio
+async def test_tizen_close_session(hass):
     """Test closing session."""
-    api = TizenLocalAPI("192.168.1.100")
+    api = TizenLocalAPI(hass, "192.168.1.100")
     
     with patch("aiohttp.ClientSession.close") as mock_close:
         mock_close.return_value = AsyncMock()
         await api.close()
+        # The session belongs to Home Assistant and must stay open
+        mock_close.assert_not_called()
+
+
+def test_token_bucket_allows_burst():
+    """Test the rate limiter lets a full burst through without waiting."""
+    bucket = _TokenBucket(rate=3.0, capacity=3)
+    
+    assert [bucket.take_nowait() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.take_nowait() > 0